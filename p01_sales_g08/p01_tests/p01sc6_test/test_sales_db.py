@@ -0,0 +1,97 @@
+
+# Provides the tools for creating and running tests.
+import unittest
+
+import shutil
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'p01sc06_OOPDBGUI3tier'))
+import p01beg_1da_sales_db as db
+from p01beg_1da_sales import Sales, Regions
+
+sales_db_sqlite: Path = Path(__file__).parent.parent.parent / 'p01_db' / 'sales_db.sqlite'
+
+
+class TestSQLiteDBAccess(unittest.TestCase):
+
+    def setUp(self):
+        """Point SQLiteDBAccess at a temporary copy of the shipped database"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_file = Path(self.tmpdir.name) / 'sales_db.sqlite'
+        shutil.copyfile(sales_db_sqlite, self.db_file)
+        self.saved_path = db.SQLiteDBAccess.SQLITEDBPATH
+        db.SQLiteDBAccess.SQLITEDBPATH = Path(self.tmpdir.name)
+        self.dbaccess = db.SQLiteDBAccess()
+
+    def tearDown(self):
+        """Close the connection, restore the database path and remove the copy"""
+        self.dbaccess.close()
+        db.SQLiteDBAccess.SQLITEDBPATH = self.saved_path
+        self.tmpdir.cleanup()
+
+    def index_names(self) -> list:
+        with sqlite3.connect(self.db_file) as conn:
+            rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'Sales'")
+            return [name for name, in rows]
+
+    def drop_sales_index(self):
+        with sqlite3.connect(self.db_file) as conn:
+            conn.execute("DROP INDEX IF EXISTS ix_sales_date_region")
+
+    def test_ensure_schema_creates_sales_index(self):
+        self.drop_sales_index()
+        self.dbaccess.ensure_schema()
+        self.assertIn("ix_sales_date_region", self.index_names())
+
+    def test_ensure_schema_can_run_again(self):
+        self.dbaccess.ensure_schema()
+        self.dbaccess.ensure_schema()
+        self.assertEqual(self.index_names().count("ix_sales_date_region"), 1)
+
+    def test_reads_do_not_change_the_schema(self):
+        self.drop_sales_index()
+        regions = self.dbaccess.retrieve_regions()
+        self.assertEqual([region.code for region in regions], ['w', 'm', 'c', 'e'])
+        sales = self.dbaccess.retrieve_sales_by_date_region(date(2021, 12, 22), 'w')
+        self.assertEqual(sales.id, 1)
+        self.assertNotIn("ix_sales_date_region", self.index_names())
+
+    def sales_rows(self, ids) -> list:
+        with sqlite3.connect(self.db_file) as conn:
+            query = f"SELECT ID, amount, salesDate, region FROM Sales WHERE ID IN ({','.join('?' * len(ids))}) ORDER BY ID"
+            return conn.execute(query, ids).fetchall()
+
+    def test_update_sales_many_updates_every_record(self):
+        self.dbaccess.update_sales_many([Sales(1, 111.0, date(2021, 12, 22), 'w'),
+                                         Sales(2, 222.0, date(2021, 9, 10), 'm')])
+        self.assertEqual(self.sales_rows([1, 2]), [(1, 111.0, '2021-12-22', 'w'),
+                                                   (2, 222.0, '2021-09-10', 'm')])
+
+    def test_update_sales_many_stores_region_codes(self):
+        regions = Regions()     # Sales built the way the GUI builds them, with Region objects
+        self.dbaccess.update_sales_many([Sales(1, 111.0, date(2021, 12, 22), regions.get('c')),
+                                         Sales(2, 222.0, date(2021, 9, 10), regions.get('e'))])
+        self.assertEqual(self.sales_rows([1, 2]), [(1, 111.0, '2021-12-22', 'c'),
+                                                   (2, 222.0, '2021-09-10', 'e')])
+
+    def test_update_sales_many_is_one_transaction(self):
+        before = self.sales_rows([1, 2])
+        bad_sales = Sales(2, 222.0, date(2021, 9, 10), object())   # region cannot be stored
+        with self.assertRaises(sqlite3.Error):
+            self.dbaccess.update_sales_many([Sales(1, 111.0, date(2021, 12, 22), 'w'), bad_sales])
+        self.assertEqual(self.sales_rows([1, 2]), before)
+
+    def test_close_releases_the_connection(self):
+        conn = self.dbaccess.connect()
+        self.dbaccess.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        self.assertIsNot(self.dbaccess.connect(), conn)   # a later call opens a new connection
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,31 @@
-from functools import singledispatch
+from datetime import date
 from pathlib import Path  # pathlib is preferred to os.path.join
 import csv
+import re
+import sys
 
 # Regions
 VALID_REGIONS = {"w": "West", "m": "Mountain", "c": "Central", "e": "East"}
+# region codes in either case --> region name (codes are single letters)
+REGION_NAMES = VALID_REGIONS | {code.upper(): name for code, name in VALID_REGIONS.items()}
 # Sales date
 DATE_FORMAT = "%Y-%m-%d"
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)  # yyyy-mm-dd shape only; fromisoformat() parses
 MIN_YEAR, MAX_YEAR = 2000, 2999
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)  # February in a common year
+# Sales table (view_sales): column widths 5, 15, 15, 15, 15
+SALES_HEADER = f"{'':5}{'Date':15}{'Quarter':15}{'Region':15}{'Amount':>15}"
+SALES_HLINE = "-" * 65
+SALES_ROW_FORMAT = "{:<5}{:15}{:<15}{:15}{:>15}"
+SALES_TOTAL_FORMAT = "{:50}{:>15}"
 # files
 FILEPATH = Path(__file__).parent.parent / 'p01_files'
 IMPORTED_FILES = 'imported_files.txt'
 ALL_SALES = 'all_sales.csv'
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB buffer for CSV reads and writes (default is 8 KiB)
 NAMING_CONVENTION = "sales_qn_yyyy_r.csv"
+FILENAME_PATTERN = re.compile(r"sales_q[1-4]_\d{4}_(.)\.csv", re.ASCII)  # region code captured
+_imported_cache: set[str] | None = None  # filled from IMPORTED_FILES on first use
 
 
 # --------------- Sales Input and Files (Data Access) ------------------------
@@ -65,25 +79,14 @@ def input_month() -> int:
 
 
 def is_leap_year(year: int) -> bool:
-    if year % 400 == 0:  # divisible by 400 --> leap year
-        return True
-    elif year % 100 == 0:  # not divisible by 400, but by 100 --> not leap year
-        return False
-    elif year % 4 == 0:  # not divisible by 100, but by 4,  --> leap year
-        return True
-    else:
-        return False
+    # not divisible by 4 (year & 3) --> not leap year; checked first as the common case
+    return not (year & 3) and (year % 100 != 0 or year % 400 == 0)
 
 
 def cal_max_day(year: int, month: int) -> int:
-    if is_leap_year(year) and month == 2:  # short-circuit
+    if month == 2 and is_leap_year(year):  # short-circuit
         return 29
-    elif month == 2:
-        return 28
-    elif month in (4, 6, 9, 11):
-        return 30
-    else:
-        return 31
+    return MONTH_DAYS[month - 1]
 
 
 def input_day(year: int, month: int) -> int:
@@ -99,17 +102,17 @@ def input_day(year: int, month: int) -> int:
 
 def is_valid_region(region_code: str) -> bool:
     """
-    Return True if the region_code is one of the keys of the VALID_REGIONS.
-    Otherwise False
+    Return True if the region_code is one of the keys of the VALID_REGIONS,
+    in either case. Otherwise False
     """
-    return region_code.lower() in VALID_REGIONS
+    return region_code in REGION_NAMES
 
 
 def get_region_name(region_code: str) -> str:
     """
     Return the corresponding region name for a given region_code
     """
-    return VALID_REGIONS.get(region_code.lower(), "INVALID")
+    return REGION_NAMES.get(region_code, "INVALID")
 
 
 def input_region_code() -> str:
@@ -138,52 +141,43 @@ def input_date() -> str:
     """
     while True:
         entry = input(f"{'Date (yyyy-mm-dd):':20}").strip()
-        if len(entry) == 10 and entry[4] == '-' and entry[7] == '-' \
-                and entry[:4].isdigit() and entry[5:7].isdigit() \
-                and entry[8:].isdigit():
-            yyyy, mm, dd = int(entry[:4]), int(entry[5:7]), int(entry[8:])
-            if (1 <= mm <= 12) and (1 <= dd <= cal_max_day(yyyy, mm)):
-                if MIN_YEAR <= yyyy <= MAX_YEAR:
-                    return entry
-                else:
-                    print(f"Year of the date must be between {MIN_YEAR} and {MAX_YEAR}.")
-            else:
-                print(f"{entry} is not in a valid date format.")
-        else:
+        # fromisoformat() also rejects impossible days such as Feb 29 in a common year
+        try:
+            sales_date = date.fromisoformat(entry) if DATE_PATTERN.fullmatch(entry) else None
+        except ValueError:
+            sales_date = None
+        if sales_date is None:
             print(f"{entry} is not in a valid date format.")
+        elif MIN_YEAR <= sales_date.year <= MAX_YEAR:
+            return entry
+        else:
+            print(f"Year of the date must be between {MIN_YEAR} and {MAX_YEAR}.")
 
 
 def cal_quarter(month: int) -> int:
-    if month in (1, 2, 3):
-        quarter = 1
-    elif month in (4, 5, 6):
-        quarter = 2
-    elif month in (7, 8, 9):
-        quarter = 3
-    elif month in (10, 11, 12):
-        quarter = 4
-    else:
-        quarter = 0
-    return quarter
+    # months 1-3 --> 1, 4-6 --> 2, 7-9 --> 3, 10-12 --> 4, anything else --> 0
+    return (month - 1) // 3 + 1 if 1 <= month <= 12 else 0
 
 
-def correct_data_types(row):
+def correct_data_types(row) -> list:
     """
     Try to convert valid amount to float type
     and mark invalid amount or sales date as '?'
+    Return the corrected row.
     """
     try:  # amount
         row[0] = float(row[0])  # convert to float
     except ValueError:
         row[0] = "?"  # Mark invalid amount as bad
-    # date
-    if len(row[1]) == 10 and row[1][4] == '-' and row[1][7] == '-' \
-            and row[1][:4].isdigit() and row[1][5:7].isdigit() and row[1][8:10].isdigit():
-        yyyy, mm, dd = int(row[1][:4]), int(row[1][5:7]), int(row[1][8:10])
-        if not (1 <= mm <= 12) or not (1 <= dd <= cal_max_day(yyyy, mm)):
+    # date: date.fromisoformat() parses and checks month/day ranges in C
+    sales_date = row[1]
+    try:
+        if not DATE_PATTERN.fullmatch(sales_date) \
+                or not (MIN_YEAR <= date.fromisoformat(sales_date).year <= MAX_YEAR):
             row[1] = "?"  # Mark invalid date as bad
-    else:
+    except ValueError:
         row[1] = "?"  # Mark invalid date as bad
+    return row
 
 
 def has_bad_amount(data: dict) -> bool:
@@ -198,28 +192,16 @@ def has_bad_data(data: dict) -> bool:
     return has_bad_amount(data) or has_bad_date(data)
 
 
-@singledispatch
-def import_sales(filepath_name: Path, delimiter: str = ',') -> list:
-    with open(filepath_name, newline='') as csvfile:
-        reader = csv.reader(csvfile, delimiter=delimiter)
-        filename = filepath_name.name
-        region_code = get_region_code(filename)
-
-        imported_sales_list = []
-        for amount_sales_date in reader:
-            correct_data_types(amount_sales_date)
-            amount, sales_date = amount_sales_date[0], amount_sales_date[1]
-            data = {
-                "amount": amount,
-                "sales_date": sales_date,
-                "region": get_region_name(region_code)
-            }
-            imported_sales_list.append(data)
-        return imported_sales_list
-
-
-@import_sales.register
-def _(sales_list: list) -> None:
+def import_sales_from_file(filepath_name: Path, delimiter: str = ',') -> list:
+    # every row of a regional file shares the region taken from its filename
+    region = get_region_name(get_region_code(filepath_name.name))
+    with open(filepath_name, newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+        reader = csv.reader(csvfile, delimiter=delimiter, skipinitialspace=True)
+        return [{"amount": amount_sales_date[0], "sales_date": amount_sales_date[1], "region": region}
+                for amount_sales_date in map(correct_data_types, reader)]
+
+
+def import_sales_interactive(sales_list: list) -> None:
     filename = input("Enter name of file to import: ")
     filepath_name = FILEPATH / filename
     if not is_valid_filename_format(filename):
@@ -230,7 +212,7 @@ def _(sales_list: list) -> None:
         filename = filename.replace("\n", "")
         print(f"File '{filename}' has already been imported.")
     else:
-        imported_sales_list = import_sales(filepath_name)
+        imported_sales_list = import_sales_from_file(filepath_name)
         if imported_sales_list is None:
             print(f"Fail to import sales from '{filename}'.")
         else:
@@ -238,65 +220,60 @@ def _(sales_list: list) -> None:
             if bad_data_flag:
                 print(f"File '{filename}' contains bad data.\nPlease correct the data in the file and try again.")
             elif len(imported_sales_list) > 0:
-                sales_list.extend(imported_sales_list)
+                sales_list += imported_sales_list
                 print("Imported sales added to list.\n")
                 add_imported_file(filepath_name)
 
 
+def _complete_rows(reader):
+    """Yield the rows that have all three fields, reporting each incomplete row skipped."""
+    for row in reader:
+        if len(row) < 3:
+            print(f"Skipping incomplete row: {row}")
+        else:
+            yield row
+
+
 def import_all_sales() -> list:
-    sales_data = []
-    with open(FILEPATH / ALL_SALES, newline='') as csvfile:
-        reader = csv.reader(csvfile, delimiter=',')
-        for row in reader:
-            if len(row) < 3:
-                print(f"Skipping incomplete row: {row}")
-                continue
-
-            amount, sales_date, region_code = row
-            data = {
-                "amount": float(amount.strip()),
-                "sales_date": sales_date.strip(),
-                "region": get_region_name(region_code.strip())
-            }
-            sales_data.append(data)
-    return sales_data
+    with open(FILEPATH / ALL_SALES, newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+        reader = csv.reader(csvfile, delimiter=',', skipinitialspace=True)
+        return [{"amount": float(amount),  # float() ignores surrounding whitespace
+                 "sales_date": sales_date.strip(),
+                 "region": get_region_name(region_code.strip())}
+                for amount, sales_date, region_code in _complete_rows(reader)]
 
 
 def view_sales(sales_list: list) -> bool:
-    col1_w, col2_w, col3_w, col4_w, col5_w = 5, 15, 15, 15, 15
     bad_data_flag = False
     if len(sales_list) == 0:
         print("No sales to view.\n")
         return bad_data_flag
 
-    total_w = col1_w + col2_w + col3_w + col4_w + col5_w
-    print(f"{'':{col1_w}}{'Date':{col2_w}}{'Quarter':{col3_w}}{'Region':{col4_w}}{'Amount':>{col5_w}}")
-    print(horizontal_line := f"{'-' * total_w}")
+    # build every line first and write them in one call instead of one print per row
+    lines = [SALES_HEADER, SALES_HLINE]
+    row_format = SALES_ROW_FORMAT.format
     total = 0.0
 
     for idx, sales in enumerate(sales_list, start=1):
-        if has_bad_data(sales):
+        # look up each field once per row
+        amount, sales_date, region = sales['amount'], sales['sales_date'], sales['region']
+        bad_date = has_bad_date(sales)
+        if bad_date or has_bad_amount(sales):
             bad_data_flag = True
             num = f"{idx}.*"
         else:
             num = f"{idx}."
 
-        amount = float(sales['amount'])
+        amount = float(amount)
         total += amount
 
-        sales_date = sales['sales_date']
-        if has_bad_date(sales):
-            bad_data_flag = True
-            month = 0
-        else:
-            month = int(sales_date.split('-')[1])
-
-        region = sales['region']
+        month = 0 if bad_date else int(sales_date.split('-')[1])
         quarter = f"{cal_quarter(month)}"
-        print(f"{num:<{col1_w}}{sales_date:{col2_w}}{quarter:<{col3_w}}{region:{col4_w}}{amount:>{col5_w}}")
+        lines.append(row_format(num, sales_date, quarter, region, amount))
 
-    print(horizontal_line)
-    print(f"{'TOTAL':{col1_w}}{' ':{col2_w + col3_w + col4_w}}{total:>{col5_w}}\n")
+    lines.append(SALES_HLINE)
+    lines.append(SALES_TOTAL_FORMAT.format("TOTAL", total) + "\n")
+    sys.stdout.write("\n".join(lines) + "\n")
     return bad_data_flag
 
 
@@ -346,11 +323,7 @@ def is_valid_filename_format(filename: str) -> bool:
     Return True if the filename is in the valid filename format.
     Otherwise, False.
     """
-    return (len(filename) == len(NAMING_CONVENTION) and
-            filename[:7] == NAMING_CONVENTION[:7] and
-            filename[8] == NAMING_CONVENTION[8] and
-            filename[13] == NAMING_CONVENTION[-6] and
-            filename[-4:] == NAMING_CONVENTION[-4:])
+    return FILENAME_PATTERN.fullmatch(filename) is not None
 
 
 def get_region_code(sales_filename: str) -> str:
@@ -359,37 +332,50 @@ def get_region_code(sales_filename: str) -> str:
     If the filename follows the naming convention, the region code
     is the character right before the extension name.
     """
-    if is_valid_filename_format(sales_filename):
-        return sales_filename[-5].lower()
+    if match := FILENAME_PATTERN.fullmatch(sales_filename):
+        return match.group(1).lower()
     return "INVALID"
 
 
+def _load_imported() -> set[str]:
+    """
+    Return the set of filenames in IMPORTED_FILES.
+    The file is read only on the first call; later calls reuse the cached set.
+    """
+    global _imported_cache
+    if _imported_cache is None:
+        try:
+            with open(IMPORTED_FILES, 'r') as file:
+                _imported_cache = {line.rstrip("\n") for line in file}  # one line in memory at a time
+        except FileNotFoundError:
+            _imported_cache = set()
+    return _imported_cache
+
+
 def already_imported(filepath_name: Path) -> bool:
     """
     Return True if the filename is in the IMPORTED_FILES.
     Otherwise, False.
     """
-    with open(IMPORTED_FILES, 'r') as file:
-        imported_files = file.read().splitlines()
-    return filepath_name.name in imported_files
+    return filepath_name.name in _load_imported()
 
 
 def add_imported_file(filepath_name: Path):
     """Add the filepath_name into IMPORTED_FILES"""
     with open(IMPORTED_FILES, 'a') as file:
         file.write(f"{filepath_name.name}\n")
+    _load_imported().add(filepath_name.name)
 
 
 def save_all_sales(sales_list, delimiter: str = ',') -> None:
     """
-    Convert each sales data dictionary in the sales_list into a list
-    Save the converted sales list which now is a list of lists into the file ALL_SALES.
+    Convert each sales data dictionary in the sales_list into a row
+    and save the rows into the file ALL_SALES.
+    Rows are generated lazily, so no converted copy of the sales list is built.
     """
-    converted_sales_list = [[sale["amount"], sale["sales_date"], sale["region"]] for sale in sales_list]
-
-    with open(ALL_SALES, 'w', newline='') as csvfile:
+    with open(ALL_SALES, 'w', newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
         writer = csv.writer(csvfile, delimiter=delimiter)
-        writer.writerows(converted_sales_list)
+        writer.writerows((sale["amount"], sale["sales_date"], sale["region"]) for sale in sales_list)
 
     print(f"All sales data has been saved to '{ALL_SALES}'.")
 
@@ -403,23 +389,23 @@ def main():
     view_sales(sales_list)
 
     print("\nPlease enter file name 'region1'")
-    import_sales(sales_list)  # region1
+    import_sales_interactive(sales_list)  # region1
     print("\nPlease enter file name 'sales_q1_2021_x.csv'")
-    import_sales(sales_list)  # sales_q1_2021_x.csv
+    import_sales_interactive(sales_list)  # sales_q1_2021_x.csv
     print("\nPlease enter file name 'sales_q2_2021_w.csv'")
-    import_sales(sales_list)  # sales_q2_2021_w.csv
+    import_sales_interactive(sales_list)  # sales_q2_2021_w.csv
     print("\nPlease enter file name 'sales_q3_2021_w.csv'")
-    import_sales(sales_list)  # sales_q3_2021_w.csv
+    import_sales_interactive(sales_list)  # sales_q3_2021_w.csv
     view_sales(sales_list)
 
     print("\nPlease enter file name 'sales_q4_2021_w.csv'")
-    import_sales(sales_list)  # sales_q4_2021_w.csv, including add_imported_file()
+    import_sales_interactive(sales_list)  # sales_q4_2021_w.csv, including add_imported_file()
     print("\nPlease enter file name 'sales_q4_2021_w.csv' again")
-    import_sales(sales_list)
+    import_sales_interactive(sales_list)
     save_all_sales(sales_list)
 
     print("\nPlease enter file name 'sales_q1_2021_w.csv'")
-    import_sales(sales_list)  # sales_q1_2021_w.csv, FileNotFound
+    import_sales_interactive(sales_list)  # sales_q1_2021_w.csv, FileNotFound
 
 
 if __name__ == '__main__':
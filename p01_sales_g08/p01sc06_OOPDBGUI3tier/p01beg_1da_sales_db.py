@@ -1,11 +1,10 @@
 # [import any other necessary module(s)]
 import sqlite3
-from typing import Optional, List, Any
+from typing import Optional, List, Iterable
 from pathlib import Path
 from datetime import date
 
-from p01_sales.p01sc06_OOPDBGUI3tier.p01beg_1da_sales import Regions
-from p01beg_1da_sales import Sales, Regions
+from p01beg_1da_sales import Sales, Region
 
 # -------------- Data Access (SQLite) --------------------------
 class SQLiteDBAccess:
@@ -14,17 +13,37 @@ class SQLiteDBAccess:
     def __init__(self):
         self._sqlite_sales_db = 'sales_db.sqlite'
         self._dbpath_sqlite_sales_db = SQLiteDBAccess.SQLITEDBPATH / self._sqlite_sales_db
+        self._connection: Optional[sqlite3.Connection] = None   # opened on first use, then reused
 
 
     def connect(self) -> sqlite3.Connection:
-        '''Connect to the SQLite database and return the connection object.'''
+        '''Connect to the SQLite database once and return the shared connection object.'''
+        if self._connection is None:
+            try:
+                connection = sqlite3.connect(self._dbpath_sqlite_sales_db)
+            except sqlite3.Error as e:
+                print(f"SQLite connection error: {e}")
+                raise
+            self._connection = connection
+        return self._connection
+
+    def ensure_schema(self) -> None:
+        '''Create the index that lets retrieve_sales_by_date_region avoid a table scan, if it is missing.
+        Called once at startup; the read and update methods never change the schema.'''
+        query = "CREATE INDEX IF NOT EXISTS ix_sales_date_region ON Sales(salesDate, region);"
         try:
-            connection = sqlite3.connect(self._dbpath_sqlite_sales_db)
-            return connection
+            with self.connect() as conn:
+                conn.execute(query)
         except sqlite3.Error as e:
-            print(f"SQLite connection error: {e}")
+            print(f"Error creating sales index: {e}")
             raise
 
+    def close(self) -> None:
+        '''Close the shared connection, if it is open.'''
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
     def retrieve_sales_by_date_region(self, sales_date: date, region_code: str) -> Optional[Sales]:
         '''retrieve ID, amount, salesDate, adn region field from Sales table for the records that have the given salesDate and region values.'''
         query = '''
@@ -61,19 +80,37 @@ class SQLiteDBAccess:
             print(f"Error updating sales record: {e}")
             raise
 
-    def retrieve_regions(self) -> list[Regions]:
+    def update_sales_many(self, sales_iter: Iterable[Sales]) -> None:
+        '''update amount, salesDate, and region fields of Sales table for every given record in one transaction.'''
+
+        query = '''
+            UPDATE Sales
+            SET amount = ?, salesDate = ?, region = ?
+            WHERE id = ?;
+        '''
+        try:
+            with self.connect() as conn:    # commits once after all rows, rolls back on error
+                conn.executemany(query, ((sales.amount, sales.sales_date.isoformat(),
+                                          # the Region table key is stored, not the Region object
+                                          sales.region.code if isinstance(sales.region, Region) else sales.region,
+                                          sales.id)
+                                         for sales in sales_iter))
+        except sqlite3.Error as e:
+            print(f"Error updating sales records: {e}")
+            raise
+
+    def retrieve_regions(self) -> list[Region]:
         '''retreive region code and name from Region table'''
 
         query = '''
-            SELECT regionCode, regionName
+            SELECT code, name
             FROM Region;
         '''
         try:
             with self.connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute(query)
-                rows: list[Any] = cursor.fetchall()
-                return [Regions() for row in rows]
+                # iterate the cursor directly instead of copying every row with fetchall() first
+                return [Region(code, name) for code, name in cursor.execute(query)]
         except sqlite3.Error as e:
             print(f"Error retrieving regions: {e}")
             raise
\ No newline at end of file
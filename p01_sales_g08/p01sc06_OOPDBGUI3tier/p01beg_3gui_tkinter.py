@@ -31,6 +31,7 @@ class SalesFrame(ttk.Frame):
         # for database access
         self.sales = None
         self.sqlite_dbaccess = db.SQLiteDBAccess()
+        self.sqlite_dbaccess.ensure_schema()   # create the sales lookup index once at startup
 
 
     def init_components(self):
@@ -144,8 +145,11 @@ class SalesFrame(ttk.Frame):
 def main():
     root = tk.Tk()
     root.title("Edit Sales Amount")
-    SalesFrame(root)
-    root.mainloop()
+    frame = SalesFrame(root)
+    try:
+        root.mainloop()
+    finally:
+        frame.sqlite_dbaccess.close()   # release the shared SQLite connection when the window closes
 
 
 if __name__ == "__main__":